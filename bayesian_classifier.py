@@ -25,8 +25,11 @@
 # Special Implementation Notes:
 #
 import math
+import random
 import statistics
 
+import instrumentation
+
 
 def sample_training_data():
     """
@@ -52,6 +55,26 @@ def sample_training_data():
     ]
 
 
+def gen_training_data(n, s=None):
+    """
+    generate a random training set with the same structure as the sample training data. Borrowers who do not own a home
+    and have an annual income between 80k and 100k are labeled as defaulting, as they are in the sample data, but 10% of
+    all records have their class flipped at random so that the classes overlap.
+
+    :param n: (int) the number of records to generate. Should be large enough for both classes to contain at least 2
+        records, since the variance of the annual income is computed for each class.
+    :param s: (int) the seed to use for random number generation.
+    :return: (list) a list of n records, in the same format as sample_training_data
+    """
+    random.seed(s)
+    data = []
+    for _ in range(n):
+        x = (random.random() < 0.3, random.choice('SMD'), round(random.uniform(50, 250)))
+        y = not x[0] and 80 <= x[2] <= 100
+        data.append((x, y if random.random() >= 0.1 else not y))
+    return data
+
+
 def conditional_probability(x, y, i, t, s=False, p=1):
     """
     get the conditional probability P(x|y) for a particular attribute.
@@ -64,6 +87,8 @@ def conditional_probability(x, y, i, t, s=False, p=1):
     :param p: (int) smoothing parameter. Defaults to 1, meaning smoothing will be a laplace smoothing
     :return: (float) the conditional probability P(x|y)
     """
+    instrumentation.count('conditional_probability.calls')
+    instrumentation.count('conditional_probability.records_scanned', len(t))
     m = p if s else 0
 
     def home_owner(a):
@@ -92,6 +117,7 @@ def conditional_probability(x, y, i, t, s=False, p=1):
         raise IndexError('Training data has 3 attributes. i can only be supplied with 1, 2, or 3')
 
 
+@instrumentation.timed('class_conditional_probability')
 def class_conditional_probability(x, y, t, p=1):
     """
     Determine the probability P(x|y) for an test attribute vector
@@ -123,6 +149,7 @@ def prior_probability(y, t):
         return 0
 
 
+@instrumentation.timed('predict_class')
 def predict_class(x, t=sample_training_data(), p=1, exact_matching=False):
     """
     predict a class given a certain set of attributes
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+#
+# Benchmarks
+#
+# Overview: The following program measures the throughput and scaling of bisecting_k_means, dbscan and predict_class
+# across a range of data set sizes, using the instrumentation library to record the timings and counters for each run.
+#
+# Data Sets:
+# Bisecting K-Means is run on points from gen_random_points, DBSCAN on clustered points (plus noise) from db_gen and
+# the Bayesian Classifier on training sets from gen_training_data. Every data set is generated with a fixed seed, so
+# the counters for each run (such as the number of distance calculations) are reproducible across machines, while the
+# timings are not.
+#
+# Scaling:
+# For each algorithm, the scaling exponent between consecutive sizes is reported as log(t2 / t1) / log(n2 / n1), where
+# t is the run time and n is the size of the data set. An exponent of 1 is linear, and an exponent of 2 is quadratic.
+#
+# Failures:
+# dbscan labels each cluster recursively (see dbscan.label_core_neighbors), so the recursion depth grows with the size
+# of the dense clusters. With Python's default recursion limit of 1000, the dbscan benchmark supports up to about 3000
+# points and raises a RecursionError at 3500. A size that fails is reported with its error and the remaining sizes still
+# run. A size that succeeded in the baseline but fails now is reported as a regression.
+#
+# Timing:
+# Each size is run at least --repeat times, and then repeatedly until the runs add up to at least --min-time seconds,
+# so that short runs are measured many times. The median run time is reported, along with the median absolute
+# deviation of the run times as an estimate of the noise.
+#
+# Baselines:
+# Results can be saved to a json file with --save and compared against a previously saved file with --compare. Both can
+# be given in the same run, as long as they name different files. A run is reported as a regression if any of its
+# counters differ from the baseline, and the program exits with a non-zero status if any regressions are found. Since
+# counters do not depend on the machine, this check is exact. Run times are too noisy for a hard gate, so a run is only
+# reported as a slowdown (without affecting the exit status) if its median is slower than the baseline by more than the
+# tolerance (25% by default) and by more than 3 times the larger of the two noise estimates.
+import argparse
+import json
+import math
+import os
+import statistics
+import sys
+
+import bayesian_classifier
+import bisecting_k_means
+import dbscan
+import instrumentation
+
+SEED = 2
+DEFAULT_BASELINE = 'benchmark_baseline.json'
+
+
+def bench_bisecting_k_means(n):
+    """
+    :param n: (int) the number of points to cluster
+    :return: (tuple) contains a function that runs Bisecting K-Means (k = 4, Euclidean distance, 5 trials) on n random
+        points, and the number of points it clusters
+    """
+    p = bisecting_k_means.gen_random_points(n, SEED)
+    return lambda: bisecting_k_means.bisecting_k_means(4, bisecting_k_means.euclidian_distance, p=p), n
+
+
+def bench_dbscan(n):
+    """
+    :param n: (int) the number of points to cluster
+    :return: (tuple) contains a function that runs DBSCAN (eps = 5, MinPts = 4) on n points, 90% of which are spread
+        over 3 dense squares and 10% of which are uniform noise, and the number of points it clusters
+    """
+    dense = n * 3 // 10
+    db = dbscan.db_gen([(10, 30, 10, 30, dense), (60, 80, 10, 30, dense), (35, 55, 60, 80, dense),
+                        (1, 100, 1, 100, n - 3 * dense)], SEED)
+    return lambda: dbscan.dbscan(db, 5, 4), n
+
+
+def bench_predict_class(n, m=100):
+    """
+    :param n: (int) the number of records in the training set
+    :param m: (int) the number of records to predict
+    :return: (tuple) contains a function that predicts the class of m random records using a random training set of n
+        records, and the number of predictions it makes (m)
+    """
+    t = bayesian_classifier.gen_training_data(n, SEED)
+    x = [X for X, _ in bayesian_classifier.gen_training_data(m, SEED + 1)]
+    return lambda: [bayesian_classifier.predict_class(X, t) for X in x], m
+
+
+# each benchmark's setup function and default data set sizes
+BENCHMARKS = {
+    'bisecting_k_means': (bench_bisecting_k_means, [250, 500, 1000, 2000]),
+    'dbscan': (bench_dbscan, [250, 500, 1000, 2000]),
+    'predict_class': (bench_predict_class, [250, 500, 1000, 2000])
+}
+
+
+def run(name, sizes, repeat=3, min_time=1.0, trace_memory=False):
+    """
+    run a benchmark for each data set size.
+
+    :param name: (str) the name of the benchmark (a key of BENCHMARKS)
+    :param sizes: (list) the data set sizes to run the benchmark for
+    :param repeat: (int) the minimum number of times to run each size
+    :param min_time: (float) keep running each size until the total run time is at least this many seconds
+    :param trace_memory: (bool) make an additional run of each size to measure its peak memory
+    :return: (list) a result for each size. Each result is a dictionary with the size of the data set (n), the number of
+        runs, the median run time in seconds, the noise (the median absolute deviation of the run times), the
+        throughput (the number of points clustered or records predicted per second), and the counters, timings and
+        peak memory recorded for the median run. If a size fails with a RecursionError, its result only contains the
+        size of the data set and the error.
+    """
+    setup = BENCHMARKS[name][0]
+    results = []
+    for n in sizes:
+        f, items = setup(n)
+        runs = []
+        try:
+            while len(runs) < repeat or sum(r.elapsed for r in runs) < min_time:
+                with instrumentation.Recorder() as r:
+                    f()
+                runs.append(r)
+        except RecursionError as e:
+            results.append({'n': n, 'error': 'RecursionError: ' + str(e)})
+            continue
+
+        runs.sort(key=lambda r: r.elapsed)
+        median = statistics.median(r.elapsed for r in runs)
+        result = runs[len(runs) // 2].as_dict()
+        result['n'] = n
+        result['runs'] = len(runs)
+        result['seconds'] = median
+        result['noise'] = statistics.median(abs(r.elapsed - median) for r in runs)
+        result['throughput'] = items / median
+        if trace_memory:
+            with instrumentation.Recorder(trace_memory=True) as r:
+                f()
+            result['peak_memory'] = r.peak_memory
+        results.append(result)
+    return results
+
+
+def scaling_exponents(results):
+    """
+    determine the scaling exponent between each pair of consecutive data set sizes. Sizes that failed are skipped.
+
+    :param results: (list) the results of a benchmark, in ascending order of size
+    :return: (dict) each key is a data set size, and its value is the exponent between that size and the previous
+        successful size. The first successful size has no entry.
+    """
+    ok = [r for r in results if 'error' not in r]
+    return {r2['n']: math.log(r2['seconds'] / r1['seconds']) / math.log(r2['n'] / r1['n'])
+            for r1, r2 in zip(ok, ok[1:])}
+
+
+def compare(results, baseline, tolerance=0.25):
+    """
+    compare benchmark results against a baseline. Only sizes found in both are compared.
+
+    :param results: (dict) each key is the name of a benchmark, and its value is the list of results for the benchmark
+    :param baseline: (dict) previously saved results, in the same format
+    :param tolerance: (float) how much slower than the baseline (as a fraction) a run can be before it is a slowdown
+    :return: (tuple) contains a description of each regression (a changed counter) and of each slowdown (a median run
+        time that is slower than the baseline by more than both the tolerance and the noise). Both are empty lists if
+        none are found.
+    """
+    regressions = []
+    slowdowns = []
+    for name, runs in sorted(results.items()):
+        baseline_runs = {r['n']: r for r in baseline.get(name, [])}
+        for r in runs:
+            b = baseline_runs.get(r['n'])
+            if b is None or 'error' in b:
+                continue
+            if 'error' in r:
+                regressions.append('{0} (n = {1}): failed with {2}'.format(name, r['n'], r['error']))
+                continue
+
+            ratio = r['seconds'] / b['seconds']
+            noise = 3 * max(r.get('noise', 0), b.get('noise', 0))
+            if ratio > 1 + tolerance and r['seconds'] - b['seconds'] > noise:
+                slowdowns.append('{0} (n = {1}): {2:.2f}x slower than baseline'.format(name, r['n'], ratio))
+            for counter in sorted(set(r['counters']) | set(b['counters'])):
+                if r['counters'].get(counter) != b['counters'].get(counter):
+                    regressions.append('{0} (n = {1}): {2} changed from {3} to {4}'
+                                       .format(name, r['n'], counter, b['counters'].get(counter),
+                                               r['counters'].get(counter)))
+    return regressions, slowdowns
+
+
+def print_results(name, results):
+    """
+    print the results of a benchmark to standard output.
+
+    :param name: (str) the name of the benchmark
+    :param results: (list) the results of the benchmark, in ascending order of size
+    """
+    print(name)
+    print('-------------------------')
+    exponents = scaling_exponents(results)
+    for r in results:
+        if 'error' in r:
+            print('n = {0}:\tfailed with {1}'.format(r['n'], r['error']))
+            continue
+
+        e = exponents.get(r['n'])
+        output = 'n = {0}:\t{1:.4f}s (+/- {2:.4f}s, {3} runs)\t{4:.0f}/s'.format(r['n'], r['seconds'], r['noise'],
+                                                                             r['runs'], r['throughput'])
+        if e is not None:
+            output += '\tscaling exponent = {0:.2f}'.format(e)
+        if r['peak_memory'] is not None:
+            output += '\tpeak memory = {0:.1f} KiB'.format(r['peak_memory'] / 1024)
+        print(output)
+        [print('\t' + counter + ' = ' + str(v)) for counter, v in sorted(r['counters'].items())]
+        [print('\t{0}: {1} calls, {2:.4f}s'.format(phase, t['calls'], t['seconds']))
+         for phase, t in sorted(r['timings'].items())]
+    print('\n')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Measure the throughput and scaling of each algorithm.')
+    parser.add_argument('benchmarks', nargs='*', help='the benchmarks to run: ' + ', '.join(sorted(BENCHMARKS)) +
+                        ' (default: all)')
+    parser.add_argument('--sizes', type=int, nargs='+', help='override the data set sizes for every benchmark')
+    parser.add_argument('--repeat', type=int, default=3, help='the minimum number of runs for each size (default: 3)')
+    parser.add_argument('--min-time', type=float, default=1.0,
+                        help='the minimum total run time in seconds for each size (default: 1.0)')
+    parser.add_argument('--memory', action='store_true', help='measure the peak memory of each size')
+    parser.add_argument('--save', nargs='?', const=DEFAULT_BASELINE, help='save the results as a baseline')
+    parser.add_argument('--compare', nargs='?', const=DEFAULT_BASELINE, help='compare the results to a baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='the allowed slowdown relative to the baseline (default: 0.25)')
+    args = parser.parse_args()
+    for name in args.benchmarks:
+        if name not in BENCHMARKS:
+            parser.error('unknown benchmark: ' + name)
+    if args.save and args.compare and os.path.realpath(args.save) == os.path.realpath(args.compare):
+        parser.error('--save and --compare must use different files, otherwise the results are compared to themselves')
+
+    # load the baseline before running, so that a missing baseline is reported before the benchmarks take any time
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    results = {}
+    for name in args.benchmarks or sorted(BENCHMARKS):
+        results[name] = run(name, args.sizes or BENCHMARKS[name][1], args.repeat, args.min_time, args.memory)
+        print_results(name, results[name])
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print('results saved to ' + args.save)
+
+    if args.compare:
+        regressions, slowdowns = compare(results, baseline, args.tolerance)
+        print('Slowdowns compared to ' + args.compare + ':')
+        [print(s) for s in slowdowns] if slowdowns else print('none')
+        print('\nRegressions compared to ' + args.compare + ':')
+        [print(r) for r in regressions] if regressions else print('none')
+        if regressions:
+            sys.exit(1)
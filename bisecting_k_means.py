@@ -23,12 +23,14 @@
 # When run as an executable, this program will perform Bisecting K-Means and print out all metrics for all experiments
 # using all of the metrics as defined in the Project 2 instructions. The user defined parameters used are as listed
 # in the "Report Parameters" section above.
-import csv
 import math
 import random
 import statistics
 import sys
 
+import instrumentation
+import point_io
+
 
 def euclidian_distance(p1, p2):
     """
@@ -74,6 +76,7 @@ def closest(c, p, d):
     :return: (int) the index for the list of centroids that corresponds to the closest centroid in relation to the
         provided point.
     """
+    instrumentation.count('closest.distance_calls', len(c))
     data = [(d(c_i, p), i) for i, c_i in enumerate(c)]
     data.sort(key=lambda x: x[0])
 
@@ -122,6 +125,7 @@ def csse(c, p, d):
     return sum([d(c, point) ** 2 for point in p])
 
 
+@instrumentation.timed('tsse')
 def tsse(c, d):
     """
     determine the total intra-distance for a several clusters
@@ -161,6 +165,7 @@ def max_distance(c1, c2, d):
     return round(max([d(p1, p2) for p1 in c1 for p2 in c2]), 2)
 
 
+@instrumentation.timed('basic_k_means')
 def basic_k_means(p, k, d):
     """
     perform K-Means on a set of 2-dimensional points.
@@ -174,6 +179,7 @@ def basic_k_means(p, k, d):
     # select K points randomly as initial centroids
     c = p[:k]
     while True:
+        instrumentation.count('basic_k_means.iterations')
         clusters = {i: set() for i in range(k)}
         for point in p:
             # add this point to the closest cluster, as determined by the clusters' centroids
@@ -188,6 +194,7 @@ def basic_k_means(p, k, d):
     return [clusters[i] for i in range(k)]
 
 
+@instrumentation.timed('bisecting_k_means')
 def bisecting_k_means(k, d, p=gen_random_points(20), t=5):
     """
     perform Bisecting K-Means on a set of data points.
@@ -226,15 +233,7 @@ def csv_plot(c, fp):
         that make up a particular cluster
     :param fp: (str) the csv filepath to write the results to.
     """
-    with open(fp, 'w') as csvfile:
-        fieldnames = ['cluster', 'x', 'y']
-        writer = csv.DictWriter(csvfile, lineterminator='\n', fieldnames=fieldnames)
-        writer.writeheader()
-
-        for i, cluster in enumerate(c):
-            for p in cluster:
-                writer.writerow({'cluster': i, 'x': p[0], 'y': p[1]})
-
+    point_io.write_clusters_csv(c, fp)
 
 def gen_and_print_metrics(c, d):
     """
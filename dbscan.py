@@ -26,6 +26,8 @@ import csv
 import random
 import math
 
+import instrumentation
+
 
 def dist(p1, p2):
     """
@@ -64,6 +66,8 @@ def find_neighbors(p, db, eps):
     :param eps: (int) the value of epsilon (the radius of the neighborhood)
     :return: [list] all of the neighbors of the provided point, including the point itself
     """
+    instrumentation.count('find_neighbors.calls')
+    instrumentation.count('find_neighbors.distance_calls', len(db))
     return [n for n in db if dist(p, n) <= eps]
 
 
@@ -99,6 +103,7 @@ def label_core_neighbors(neighbors, labeled, clusters, c, db, eps, min_pts):
                 label_core_neighbors(neighbors_of_n, labeled, clusters, c, db, eps, min_pts)
 
 
+@instrumentation.timed('dbscan')
 def dbscan(db, eps, min_pts):
     """
     Run the DBSCAN algorithm on a database of 2 dimensional points.
@@ -161,12 +166,9 @@ def k_dist_csv_plot(k_dist, fp):
     :param fp: (str) the filepath for the outputted csv
     """
     with open(fp, 'w') as csvfile:
-        fieldnames = ['point', 'knn']
-        writer = csv.DictWriter(csvfile, lineterminator='\n', fieldnames=fieldnames)
-        writer.writeheader()
-
-        for i, d in enumerate(k_dist):
-            writer.writerow({'point': i, 'knn': d})
+        writer = csv.writer(csvfile, lineterminator='\n')
+        writer.writerow(['point', 'knn'])
+        writer.writerows(enumerate(k_dist))
 
 
 def dbscan_csv_plot(labeled, clusters, fp):
@@ -180,16 +182,10 @@ def dbscan_csv_plot(labeled, clusters, fp):
     :param fp: (str) the filepath for the outputted csv
     """
     with open(fp, 'w') as csvfile:
-        fieldnames = ['x', 'y', 'label', 'cluster']
-        writer = csv.DictWriter(csvfile, lineterminator='\n', fieldnames=fieldnames)
-        writer.writeheader()
-
-        for point, label in labeled.items():
-            x, y = point
-            row = {'x': x, 'y': y, 'label': label}
-            if point in clusters:
-                row['cluster'] = clusters[point]
-            writer.writerow(row)
+        writer = csv.writer(csvfile, lineterminator='\n')
+        writer.writerow(['x', 'y', 'label', 'cluster'])
+        # noise points are not assigned to a cluster, so their cluster column is left empty
+        writer.writerows((x, y, label, clusters.get((x, y), '')) for (x, y), label in labeled.items())
 
 
 def print_results(labeled, clusters):
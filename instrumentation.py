@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+#
+# Instrumentation
+#
+# Overview: The following library implements an optional instrumentation layer for the Bayesian Classifier, Bisecting
+# K-Means and DBSCAN libraries. The libraries report per-phase timings and counters (such as the number of distance
+# calculations or K-Means iterations) through the timed decorator and count function below.
+#
+# Usage:
+# Nothing is recorded unless a Recorder is active. While none is active, each count is still a function call that
+# returns immediately, and each timed function still passes through one extra wrapper call. To record a run, wrap it in
+# a Recorder:
+#
+#   with Recorder(trace_memory=True) as r:
+#       bisecting_k_means(4, euclidian_distance, p=data)
+#   r.to_json('metrics.json')
+#
+# Peak Memory:
+# When trace_memory is enabled, the peak memory allocated by Python while the recorder is active is measured with
+# tracemalloc. Tracing memory slows down execution considerably, so timings recorded at the same time should not be
+# compared with timings recorded without it.
+#
+# Nesting:
+# Recorders can be nested. Every counter and timing is recorded by each active recorder, not only the innermost one,
+# and the peak memory of an outer recorder includes the peak reached while any inner recorder was active.
+import functools
+import json
+import time
+import tracemalloc
+
+_recorder = None  # the currently active recorder, if any
+
+
+class Recorder:
+    """
+    Collects the counters, per-phase timings and (optionally) the peak memory for everything run while it is active.
+    """
+    def __init__(self, trace_memory=False):
+        """
+        :param trace_memory: (bool) measure the peak memory allocated while the recorder is active
+        """
+        self.trace_memory = trace_memory
+        self.counters = {}
+        self.timings = {}
+        self.elapsed = None
+        self.peak_memory = None
+        self._peak = 0  # the highest peak seen before tracemalloc's peak was last reset by an inner recorder
+        self._previous = None
+        self._started_tracing = False
+        self._start = None
+
+    def __enter__(self):
+        global _recorder
+        self._previous = _recorder
+        _recorder = self
+
+        if self.trace_memory:
+            self._started_tracing = not tracemalloc.is_tracing()
+            if self._started_tracing:
+                tracemalloc.start()
+            else:
+                # hand the peak reached so far to the outer recorders before it is reset
+                self._previous_peak(tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        global _recorder
+        self.elapsed = time.perf_counter() - self._start
+
+        if self.trace_memory:
+            self.peak_memory = max(self._peak, tracemalloc.get_traced_memory()[1])
+            self._previous_peak(self.peak_memory)
+            if self._started_tracing:
+                tracemalloc.stop()
+        _recorder = self._previous
+
+    def _previous_peak(self, peak):
+        """
+        record a peak memory on each of the outer recorders that trace memory.
+
+        :param peak: (int) the peak memory in bytes
+        """
+        r = self._previous
+        while r is not None:
+            if r.trace_memory:
+                r._peak = max(r._peak, peak)
+            r = r._previous
+
+    def add_time(self, name, seconds):
+        """
+        record a single call to a timed phase.
+
+        :param name: (str) the name of the phase
+        :param seconds: (float) the time the call took
+        """
+        t = self.timings.setdefault(name, {'calls': 0, 'seconds': 0.0})
+        t['calls'] += 1
+        t['seconds'] += seconds
+
+    def as_dict(self):
+        """
+        get all of the recorded metrics as structured data.
+
+        :return: (dict) contains the counters, the timings for each phase (the number of calls and the total seconds),
+            the total elapsed seconds and the peak memory in bytes (None if memory was not traced).
+        """
+        return {
+            'counters': dict(self.counters),
+            'timings': {name: dict(t) for name, t in self.timings.items()},
+            'elapsed': self.elapsed,
+            'peak_memory': self.peak_memory
+        }
+
+    def to_json(self, fp):
+        """
+        write all of the recorded metrics to a json file.
+
+        :param fp: (str) the filepath for the outputted json
+        """
+        with open(fp, 'w') as f:
+            json.dump(self.as_dict(), f, indent=2, sort_keys=True)
+
+
+def count(name, n=1):
+    """
+    increment a counter on each active recorder. Does nothing if no recorder is active.
+
+    :param name: (str) the name of the counter
+    :param n: (int) the amount to increment the counter by
+    """
+    r = _recorder
+    while r is not None:
+        r.counters[name] = r.counters.get(name, 0) + n
+        r = r._previous
+
+
+def timed(name):
+    """
+    decorate a function so that each call to it is recorded as a phase on each active recorder. Calls are passed
+        straight through when no recorder is active.
+
+    :param name: (str) the name of the phase
+    :return: (function) the decorator
+    """
+    def decorator(f):
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs):
+            if _recorder is None:
+                return f(*args, **kwargs)
+
+            recorder = _recorder
+            start = time.perf_counter()
+            try:
+                return f(*args, **kwargs)
+            finally:
+                seconds = time.perf_counter() - start
+                while recorder is not None:
+                    recorder.add_time(name, seconds)
+                    recorder = recorder._previous
+        return wrapper
+    return decorator
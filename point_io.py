@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+#
+# Point I/O
+#
+# Overview: The following library implements bulk readers and writers for the 2-dimensional point sets and cluster
+# assignments used by the Bisecting K-Means and DBSCAN libraries.
+#
+# CSV:
+# Points, cluster assignments and DBSCAN labels are read from CSV files in chunks, so that very large files never need
+# to be parsed in a single pass. They are written with a single buffered writerows call rather than one dictionary per
+# row.
+#
+# Binary Columnar Format:
+# Points and cluster assignments can also be saved in the .npy format (version 1.0), which stores a contiguous block of
+# fixed width values after a small text header. The files are written and read using only the standard library, but
+# remain readable by numpy.load. When loaded with mmap_mode enabled, the values are memory-mapped rather than read
+# into memory, and the returned PointArray indexes directly into the mapped buffer.
+#
+# Clustering Loaded Points:
+# A PointArray builds a new (x, y) tuple every time a point is accessed. bisecting_k_means copies its data set into a
+# set, and dbscan scans the entire data set once for every point, so neither benefits from the memory-mapped buffer and
+# dbscan runs noticeably slower on a PointArray than on a list. Convert the points with list() before clustering them.
+# A PointArray is best suited to streaming points to and from disk, such as re-saving or exporting them.
+import array
+import ast
+import csv
+import itertools
+import mmap
+import sys
+
+NPY_MAGIC = b'\x93NUMPY'
+
+# array module type codes and their corresponding little-endian .npy descriptors
+NPY_DESCR = {'d': '<f8', 'q': '<i8', 'b': '|i1'}
+
+
+class PointArray:
+    """
+    A read-only sequence of 2-dimensional points backed by a flat buffer of x, y values. Each point is returned as a new
+    (x, y) tuple when indexed, so the sequence can be used anywhere a list of 2-dimensional tuples is expected, but
+    repeated access is slower than with a list.
+    """
+    def __init__(self, values):
+        """
+        :param values: (memoryview or array) flat buffer of doubles, where the values for the i-th point are located at
+            index 2i (x) and 2i + 1 (y)
+        """
+        if len(values) % 2:
+            raise ValueError('a point buffer must contain an even number of values')
+        self.values = values
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        release the buffer backing the points, unmapping the file if the points were loaded with mmap_mode enabled. The
+            points can no longer be accessed once closed.
+        """
+        release(self.values)
+
+    def __len__(self):
+        return len(self.values) // 2
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('point index out of range')
+        return self.values[2 * i], self.values[2 * i + 1]
+
+    def __iter__(self):
+        v = self.values
+        for i in range(0, len(v), 2):
+            yield v[i], v[i + 1]
+
+
+def release(values):
+    """
+    release a buffer returned by load_npy. If the buffer is a view into a memory-mapped file, the file is unmapped.
+        Does nothing for buffers that were read into memory.
+
+    :param values: (memoryview or array) the buffer to release
+    """
+    if isinstance(values, memoryview):
+        m = values.obj
+        values.release()
+        if isinstance(m, mmap.mmap):
+            m.close()
+
+
+def iter_columns_csv(fp, columns, chunk_size=65536):
+    """
+    read the values of one or more columns from a csv file in chunks. Any other columns are ignored.
+
+    :param fp: (str) the filepath of the csv to read
+    :param columns: (list) the names of the columns to read. Each must appear in the csv header.
+    :param chunk_size: (int) the maximum number of rows to include in each chunk
+    :return: (generator) yields lists of up to chunk_size rows, where each row is a tuple of the (str) values for the
+        requested columns, in the order the columns were requested
+    """
+    with open(fp, newline='') as csvfile:
+        reader = csv.reader(csvfile)
+        header = next(reader, None)
+        if header is None:
+            raise ValueError(fp + ' is empty: expected a csv header')
+        missing = [column for column in columns if column not in header]
+        if missing:
+            raise ValueError('the csv header is missing the column(s): ' + ', '.join(missing))
+        indexes = [header.index(column) for column in columns]
+
+        rows = (tuple(row[i] for i in indexes) for row in reader if row)
+        while True:
+            chunk = list(itertools.islice(rows, chunk_size))
+            if not chunk:
+                break
+            yield chunk
+
+
+def iter_points_csv(fp, chunk_size=65536):
+    """
+    read the 2-dimensional points from a csv file in chunks. The file must contain a header with both an "x" and a "y"
+        column. Any other columns (such as "cluster" or "label") are ignored.
+
+    :param fp: (str) the filepath of the csv to read
+    :param chunk_size: (int) the maximum number of points to include in each chunk
+    :return: (generator) yields lists of up to chunk_size 2-dimensional points (tuples)
+    """
+    for chunk in iter_columns_csv(fp, ['x', 'y'], chunk_size):
+        yield [(float(x), float(y)) for x, y in chunk]
+
+
+def read_points_csv(fp, chunk_size=65536):
+    """
+    read all of the 2-dimensional points from a csv file.
+
+    :param fp: (str) the filepath of the csv to read
+    :param chunk_size: (int) the number of rows to parse at a time
+    :return: (list) the 2-dimensional points (tuples) in the order they appear in the file
+    """
+    points = []
+    for chunk in iter_points_csv(fp, chunk_size):
+        points.extend(chunk)
+    return points
+
+
+def read_clusters_csv(fp, chunk_size=65536):
+    """
+    read a list of clusters from a csv file written by write_clusters_csv or bisecting_k_means.csv_plot.
+
+    :param fp: (str) the filepath of the csv to read
+    :param chunk_size: (int) the number of rows to parse at a time
+    :return: (list) a list of clusters, where each element is a set of 2-dimensional points (tuples). The order of the
+        clusters matches the cluster column of the csv.
+    """
+    clusters = []
+    for chunk in iter_columns_csv(fp, ['cluster', 'x', 'y'], chunk_size):
+        for c, x, y in chunk:
+            c = int(c)
+            if c >= len(clusters):
+                clusters.extend(set() for _ in range(c + 1 - len(clusters)))
+            clusters[c].add((float(x), float(y)))
+    return clusters
+
+
+def read_dbscan_csv(fp, chunk_size=65536):
+    """
+    read the results of dbscan from a csv file written by dbscan.dbscan_csv_plot.
+
+    :param fp: (str) the filepath of the csv to read
+    :param chunk_size: (int) the number of rows to parse at a time
+    :return: (tuple) contains the dictionary of labels and clusters, in the same format as returned by dbscan.dbscan
+    """
+    labeled = {}
+    clusters = {}
+    for chunk in iter_columns_csv(fp, ['x', 'y', 'label', 'cluster'], chunk_size):
+        for x, y, label, c in chunk:
+            p = (float(x), float(y))
+            labeled[p] = label
+            if c:  # noise points have an empty cluster column
+                clusters[p] = int(c)
+    return labeled, clusters
+
+
+def write_points_csv(p, fp):
+    """
+    write 2-dimensional points to a csv file.
+
+    :param p: (iterable) the 2-dimensional points to write
+    :param fp: (str) the filepath of the csv to write
+    """
+    with open(fp, 'w', newline='') as csvfile:
+        writer = csv.writer(csvfile, lineterminator='\n')
+        writer.writerow(['x', 'y'])
+        writer.writerows(p)
+
+
+def write_clusters_csv(c, fp):
+    """
+    write the points for each cluster to a csv file. This is the writer used by bisecting_k_means.csv_plot.
+
+    :param c: (list) a list of clusters. Each element should be a collection of 2-dimensional tuples that consist of the
+        points that make up a particular cluster
+    :param fp: (str) the filepath of the csv to write
+    """
+    with open(fp, 'w', newline='') as csvfile:
+        writer = csv.writer(csvfile, lineterminator='\n')
+        writer.writerow(['cluster', 'x', 'y'])
+        writer.writerows((i, x, y) for i, cluster in enumerate(c) for x, y in cluster)
+
+
+def save_npy(a, fp, shape=None):
+    """
+    save a flat array of values to a .npy file.
+
+    :param a: (array) the values to save. The array's type code must be one of the keys of NPY_DESCR.
+    :param fp: (str) the filepath of the .npy file to write
+    :param shape: (tuple) the shape of the stored array. Defaults to a 1-dimensional array the length of a.
+    """
+    if a.typecode not in NPY_DESCR:
+        raise TypeError('unsupported array type code: ' + a.typecode)
+    shape = (len(a),) if shape is None else tuple(shape)
+
+    header = "{'descr': '%s', 'fortran_order': False, 'shape': %r, }" % (NPY_DESCR[a.typecode], shape)
+    # pad the header with spaces (terminated by a newline) so that the data starts on a 64 byte boundary
+    header += ' ' * (63 - (len(NPY_MAGIC) + 4 + len(header)) % 64) + '\n'
+
+    if sys.byteorder == 'big':
+        a = array.array(a.typecode, a)
+        a.byteswap()
+
+    with open(fp, 'wb') as f:
+        f.write(NPY_MAGIC + b'\x01\x00' + len(header).to_bytes(2, 'little') + header.encode('latin1'))
+        a.tofile(f)
+
+
+def load_npy(fp, mmap_mode=False):
+    """
+    load a .npy file that was saved by save_npy (or numpy.save with a matching dtype).
+
+    :param fp: (str) the filepath of the .npy file to read
+    :param mmap_mode: (bool) When set to true, the file is memory-mapped and the values are returned as a read-only view
+        into the mapping, rather than being read into memory. The mapping stays open until the view is passed to
+        release.
+    :return: (tuple) contains the flat values and the shape of the stored array. The values are an array when
+        mmap_mode is false, else a memoryview.
+    """
+    with open(fp, 'rb') as f:
+        if f.read(len(NPY_MAGIC)) != NPY_MAGIC:
+            raise ValueError(fp + ' is not a .npy file')
+        major = f.read(2)[0]
+        header_len = int.from_bytes(f.read(2 if major == 1 else 4), 'little')
+        header = ast.literal_eval(f.read(header_len).decode('latin1'))
+        offset = f.tell()
+
+        typecodes = {v: k for k, v in NPY_DESCR.items()}
+        if header['descr'] not in typecodes or header['fortran_order']:
+            raise TypeError('unsupported .npy array: ' + str(header))
+        typecode = typecodes[header['descr']]
+        shape = tuple(header['shape'])
+        itemsize = array.array(typecode).itemsize
+        count = 1
+        for dim in shape:
+            count *= dim
+
+        if mmap_mode and sys.byteorder == 'little':
+            if count == 0:
+                return array.array(typecode), shape
+            m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(m) < offset + count * itemsize:
+                m.close()
+                raise ValueError('{0} is truncated: expected {1} values'.format(fp, count))
+            return memoryview(m)[offset:offset + count * itemsize].cast(typecode), shape
+
+        a = array.array(typecode)
+        a.fromfile(f, count)
+        if sys.byteorder == 'big':
+            a.byteswap()
+        return a, shape
+
+
+def save_points(p, fp):
+    """
+    save 2-dimensional points to a .npy file as an (n, 2) array of doubles.
+
+    :param p: (iterable) the 2-dimensional points to save
+    :param fp: (str) the filepath of the .npy file to write
+    """
+    values = p.values if isinstance(p, PointArray) else (v for point in p for v in point)
+    a = array.array('d', values)
+    save_npy(a, fp, (len(a) // 2, 2))
+
+
+def load_points(fp, mmap_mode=False):
+    """
+    load 2-dimensional points from a .npy file saved by save_points.
+
+    :param fp: (str) the filepath of the .npy file to read
+    :param mmap_mode: (bool) memory-map the file rather than reading it into memory. The file stays mapped until the
+        returned PointArray is closed.
+    :return: (PointArray) the 2-dimensional points
+    """
+    values, shape = load_npy(fp, mmap_mode)
+    if len(shape) != 2 or shape[1] != 2:
+        release(values)
+        raise ValueError('expected an (n, 2) array of points, not ' + str(shape))
+    return PointArray(values)
+
+
+def save_clusters(c, points_fp, assignments_fp):
+    """
+    save a list of clusters as two .npy files: an (n, 2) array of the points and a parallel array of the cluster index
+        each point belongs to.
+
+    :param c: (list) a list of clusters. Each element should be a collection of 2-dimensional tuples that consist of the
+        points that make up a particular cluster
+    :param points_fp: (str) the filepath of the .npy file to write the points to
+    :param assignments_fp: (str) the filepath of the .npy file to write the cluster indexes to
+    """
+    points = array.array('d')
+    assignments = array.array('q')
+    for i, cluster in enumerate(c):
+        for x, y in cluster:
+            points.append(x)
+            points.append(y)
+            assignments.append(i)
+    save_npy(points, points_fp, (len(assignments), 2))
+    save_npy(assignments, assignments_fp)
+
+
+def save_dbscan(labeled, clusters, points_fp, assignments_fp, labels_fp):
+    """
+    save the results of dbscan as three .npy files: an (n, 2) array of every point in the database, a parallel array of
+        the cluster each point belongs to and a parallel array of each point's label. Noise points are assigned to
+        cluster 0, since dbscan numbers its clusters starting at 1. Labels are stored as the character code of "C", "B"
+        or "N".
+
+    :param labeled: (dict) each key a point in the db, and its value the point's corresponding label, where "C" stands
+        for core point, "B" stands for border point, and "N" stands for noise point.
+    :param clusters: (dict) each key is a point in the db, and its value is the point's corresponding cluster it belongs
+        to. (Noise points will not have an entry in this collection.)
+    :param points_fp: (str) the filepath of the .npy file to write the points to
+    :param assignments_fp: (str) the filepath of the .npy file to write the cluster indexes to
+    :param labels_fp: (str) the filepath of the .npy file to write the labels to
+    """
+    points = array.array('d', (v for point in labeled for v in point))
+    assignments = array.array('q', (clusters.get(point, 0) for point in labeled))
+    labels = array.array('b', (ord(label) for label in labeled.values()))
+    save_npy(points, points_fp, (len(assignments), 2))
+    save_npy(assignments, assignments_fp)
+    save_npy(labels, labels_fp)
+
+
+def load_dbscan(points_fp, assignments_fp, labels_fp, mmap_mode=False):
+    """
+    load the results of dbscan saved by save_dbscan.
+
+    :param points_fp: (str) the filepath of the .npy file containing the points
+    :param assignments_fp: (str) the filepath of the .npy file containing the cluster indexes
+    :param labels_fp: (str) the filepath of the .npy file containing the labels
+    :param mmap_mode: (bool) memory-map the files rather than reading them into memory
+    :return: (tuple) contains the dictionary of labels and clusters, in the same format as returned by dbscan.dbscan
+    """
+    with load_points(points_fp, mmap_mode) as points:
+        assignments, _ = load_npy(assignments_fp, mmap_mode)
+        try:
+            labels, _ = load_npy(labels_fp, mmap_mode)
+            try:
+                if not len(points) == len(assignments) == len(labels):
+                    raise ValueError('the number of points, cluster assignments and labels must match')
+
+                labeled = {}
+                clusters = {}
+                for p, c, label in zip(points, assignments, labels):
+                    labeled[p] = chr(label)
+                    if label != ord('N'):
+                        clusters[p] = c
+            finally:
+                release(labels)
+        finally:
+            release(assignments)
+    return labeled, clusters
+
+
+def load_clusters(points_fp, assignments_fp, mmap_mode=False):
+    """
+    load a list of clusters saved by save_clusters.
+
+    :param points_fp: (str) the filepath of the .npy file containing the points
+    :param assignments_fp: (str) the filepath of the .npy file containing the cluster indexes
+    :param mmap_mode: (bool) memory-map the files rather than reading them into memory
+    :return: (list) a list of clusters, where each element is a set of 2-dimensional points (tuples). The order of the
+        clusters matches the stored cluster indexes.
+    """
+    with load_points(points_fp, mmap_mode) as points:
+        assignments, _ = load_npy(assignments_fp, mmap_mode)
+        try:
+            if len(assignments) != len(points):
+                raise ValueError('the number of points and cluster assignments must match')
+
+            clusters = [set() for _ in range(max(assignments) + 1 if len(assignments) else 0)]
+            for i, p in zip(assignments, points):
+                clusters[i].add(p)
+        finally:
+            release(assignments)
+    return clusters
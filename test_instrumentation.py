@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+#
+# Instrumentation Tests
+#
+# Overview: Tests for the Recorder, count and timed hooks in instrumentation, including the counters reported by the
+# Bisecting K-Means, DBSCAN and Bayesian Classifier libraries for fixed-seed data sets.
+import json
+import os
+import tempfile
+import unittest
+
+import bayesian_classifier
+import bisecting_k_means
+import dbscan
+import instrumentation
+
+
+@instrumentation.timed('fail')
+def fail():
+    raise KeyError('fail')
+
+
+class InstrumentationTest(unittest.TestCase):
+    def test_inactive(self):
+        instrumentation.count('ignored')
+        self.assertIsNone(instrumentation._recorder)
+        self.assertEqual(bisecting_k_means.closest([(0, 0), (5, 5)], (4, 4), bisecting_k_means.euclidian_distance), 1)
+
+    def test_closest_and_find_neighbors(self):
+        with instrumentation.Recorder() as r:
+            bisecting_k_means.closest([(0, 0), (5, 5), (9, 9)], (4, 4), bisecting_k_means.euclidian_distance)
+            dbscan.find_neighbors((1, 1), [(1, 1), (2, 2), (50, 50), (60, 60)], 5)
+        self.assertEqual(r.counters, {'closest.distance_calls': 3,
+                                      'find_neighbors.calls': 1,
+                                      'find_neighbors.distance_calls': 4})
+
+    def test_bisecting_k_means_counters(self):
+        p = bisecting_k_means.gen_random_points(100, 2)
+        with instrumentation.Recorder() as r:
+            bisecting_k_means.bisecting_k_means(2, bisecting_k_means.euclidian_distance, p=p)
+        self.assertEqual(r.counters, {'basic_k_means.iterations': 15, 'closest.distance_calls': 3000})
+        self.assertEqual(r.timings['basic_k_means']['calls'], 5)
+        self.assertEqual(r.timings['bisecting_k_means']['calls'], 1)
+
+    def test_dbscan_counters(self):
+        db = dbscan.db_gen([(0, 20, 0, 20, 60), (0, 100, 0, 100, 30)], 2)
+        with instrumentation.Recorder() as r:
+            dbscan.dbscan(db, 5, 4)
+        self.assertEqual(r.counters, {'find_neighbors.calls': 90, 'find_neighbors.distance_calls': 8100})
+
+    def test_predict_class_counters(self):
+        with instrumentation.Recorder() as r:
+            bayesian_classifier.predict_class((True, 'M', 50.7))
+        self.assertEqual(r.counters, {'conditional_probability.calls': 12,
+                                      'conditional_probability.records_scanned': 120})
+        self.assertEqual(r.timings['class_conditional_probability']['calls'], 2)
+
+    def test_nested_counters(self):
+        with instrumentation.Recorder() as outer:
+            instrumentation.count('a')
+            with instrumentation.Recorder() as inner:
+                instrumentation.count('a', 2)
+                bisecting_k_means.centroid({(1, 1)}, bisecting_k_means.euclidian_distance)
+                bisecting_k_means.tsse([{(1, 1), (3, 3)}], bisecting_k_means.euclidian_distance)
+        self.assertEqual(outer.counters, {'a': 3})
+        self.assertEqual(inner.counters, {'a': 2})
+        self.assertEqual(outer.timings['tsse']['calls'], 1)
+        self.assertEqual(inner.timings['tsse']['calls'], 1)
+        self.assertIsNone(instrumentation._recorder)
+
+    def test_nested_peak_memory(self):
+        with instrumentation.Recorder(trace_memory=True) as outer:
+            x = bytearray(4000000)
+            del x
+            with instrumentation.Recorder(trace_memory=True) as inner:
+                y = bytearray(1000000)
+                del y
+        self.assertGreaterEqual(inner.peak_memory, 1000000)
+        self.assertGreaterEqual(outer.peak_memory, 4000000)
+        self.assertGreaterEqual(outer.peak_memory, inner.peak_memory)
+
+        with instrumentation.Recorder(trace_memory=True) as outer:
+            with instrumentation.Recorder(trace_memory=True) as inner:
+                y = bytearray(2000000)
+                del y
+        self.assertGreaterEqual(outer.peak_memory, inner.peak_memory)
+        self.assertGreaterEqual(outer.peak_memory, 2000000)
+
+    def test_exception(self):
+        with self.assertRaises(KeyError):
+            with instrumentation.Recorder() as outer:
+                with instrumentation.Recorder(trace_memory=True):
+                    fail()
+        self.assertIsNone(instrumentation._recorder)
+        self.assertEqual(outer.timings['fail']['calls'], 1)
+        self.assertIsNotNone(outer.elapsed)
+
+    def test_export(self):
+        with instrumentation.Recorder(trace_memory=True) as r:
+            instrumentation.count('a', 5)
+            bisecting_k_means.tsse([{(1, 1)}], bisecting_k_means.euclidian_distance)
+
+        d = r.as_dict()
+        self.assertEqual(set(d), {'counters', 'timings', 'elapsed', 'peak_memory'})
+        self.assertEqual(d['counters'], {'a': 5})
+        self.assertEqual(set(d['timings']['tsse']), {'calls', 'seconds'})
+
+        with tempfile.TemporaryDirectory() as tmp:
+            fp = os.path.join(tmp, 'metrics.json')
+            r.to_json(fp)
+            with open(fp) as f:
+                self.assertEqual(json.load(f), d)
+
+
+if __name__ == '__main__':
+    unittest.main()
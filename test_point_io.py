@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+#
+# Point I/O Tests
+#
+# Overview: Round-trip tests for the csv and .npy readers and writers in point_io. The numpy compatibility test only
+# runs when numpy is installed.
+import array
+import ast
+import os
+import tempfile
+import unittest
+
+import bisecting_k_means
+import dbscan
+import point_io
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class PointIOTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.points = bisecting_k_means.gen_random_points(100, 2)
+        self.clusters = bisecting_k_means.bisecting_k_means(3, bisecting_k_means.euclidian_distance, p=self.points)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.dir.name, name)
+
+    def test_points_round_trip(self):
+        point_io.save_points(self.points, self.path('p.npy'))
+        for mmap_mode in (False, True):
+            with point_io.load_points(self.path('p.npy'), mmap_mode) as p:
+                self.assertEqual(len(p), 100)
+                self.assertEqual(list(p), self.points)
+                self.assertEqual(p[-1], self.points[-1])
+                self.assertEqual(p[:3], self.points[:3])
+
+    def test_empty_points_round_trip(self):
+        point_io.save_points([], self.path('p.npy'))
+        for mmap_mode in (False, True):
+            self.assertEqual(list(point_io.load_points(self.path('p.npy'), mmap_mode)), [])
+
+    def test_truncated_file(self):
+        point_io.save_points(self.points, self.path('p.npy'))
+        os.truncate(self.path('p.npy'), os.path.getsize(self.path('p.npy')) - 16 * 10)
+        with self.assertRaises(ValueError):
+            point_io.load_points(self.path('p.npy'), True)
+        with self.assertRaises(EOFError):
+            point_io.load_points(self.path('p.npy'))
+
+    def test_clusters_round_trip(self):
+        point_io.save_clusters(self.clusters, self.path('p.npy'), self.path('c.npy'))
+        for mmap_mode in (False, True):
+            self.assertEqual(point_io.load_clusters(self.path('p.npy'), self.path('c.npy'), mmap_mode), self.clusters)
+
+    def test_dbscan_round_trip(self):
+        db = dbscan.db_gen([(0, 20, 0, 20, 60), (0, 100, 0, 100, 30)], 2)
+        result = dbscan.dbscan(db, 5, 4)
+        self.assertEqual(set(result[0].values()), {'C', 'B', 'N'})
+
+        point_io.save_dbscan(*result, self.path('p.npy'), self.path('c.npy'), self.path('l.npy'))
+        for mmap_mode in (False, True):
+            self.assertEqual(point_io.load_dbscan(self.path('p.npy'), self.path('c.npy'), self.path('l.npy'),
+                                                  mmap_mode), result)
+
+        dbscan.dbscan_csv_plot(*result, self.path('d.csv'))
+        self.assertEqual(point_io.read_dbscan_csv(self.path('d.csv'), chunk_size=7), result)
+
+    def test_csv_round_trip(self):
+        point_io.write_points_csv(self.points, self.path('p.csv'))
+        self.assertEqual(point_io.read_points_csv(self.path('p.csv'), chunk_size=7), self.points)
+        self.assertEqual([len(c) for c in point_io.iter_points_csv(self.path('p.csv'), 30)], [30, 30, 30, 10])
+
+        bisecting_k_means.csv_plot(self.clusters, self.path('c.csv'))
+        self.assertEqual(point_io.read_clusters_csv(self.path('c.csv'), chunk_size=7), self.clusters)
+
+    def test_empty_csv(self):
+        open(self.path('e.csv'), 'w').close()
+        with self.assertRaises(ValueError):
+            point_io.read_points_csv(self.path('e.csv'))
+
+    def test_header(self):
+        point_io.save_npy(array.array('d', range(6)), self.path('a.npy'), (3, 2))
+        with open(self.path('a.npy'), 'rb') as f:
+            data = f.read()
+
+        self.assertEqual(data[:8], b'\x93NUMPY\x01\x00')
+        header_len = int.from_bytes(data[8:10], 'little')
+        header = data[10:10 + header_len].decode('latin1')
+        self.assertEqual((10 + header_len) % 64, 0)
+        self.assertTrue(header.endswith('\n'))
+        self.assertEqual(ast.literal_eval(header), {'descr': '<f8', 'fortran_order': False, 'shape': (3, 2)})
+        self.assertEqual(len(data), 10 + header_len + 6 * 8)
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_numpy_compatibility(self):
+        point_io.save_points(self.points, self.path('p.npy'))
+        self.assertEqual([tuple(p) for p in numpy.load(self.path('p.npy')).tolist()], self.points)
+
+        numpy.save(self.path('n.npy'), numpy.array(self.points, dtype='<f8'))
+        self.assertEqual(list(point_io.load_points(self.path('n.npy'), True)), self.points)
+
+
+if __name__ == '__main__':
+    unittest.main()